@@ -0,0 +1,37 @@
+"""
+Measure the time to import the package in a fresh interpreter, with and without Flask.
+
+Usage: python benchmarks/import_benchmark.py [repeat]
+"""
+import subprocess
+import sys
+
+
+SCENARIOS = [
+    ('python (baseline)', 'pass'),
+    ('import flask_log_request_id', 'import flask_log_request_id'),
+    ('RequestIDLogFilter only', 'from flask_log_request_id import RequestIDLogFilter; RequestIDLogFilter()'),
+    ('RequestID (imports Flask)', 'from flask_log_request_id import RequestID'),
+]
+
+
+def measure(statement, repeat):
+    code = (
+        'import time; _start = time.perf_counter(); {}; _end = time.perf_counter(); '
+        'import sys; print(_end - _start, "flask" in sys.modules)'
+    ).format(statement)
+    timings = []
+    for _ in range(repeat):
+        elapsed, flask_loaded = subprocess.check_output([sys.executable, '-c', code]).decode().split()
+        timings.append(float(elapsed))
+    return min(timings) * 1e3, flask_loaded == 'True'
+
+
+def main(repeat):
+    for name, statement in SCENARIOS:
+        elapsed_ms, flask_loaded = measure(statement, repeat)
+        print('{:<30} {:8.2f} ms  flask loaded: {}'.format(name, elapsed_ms, flask_loaded))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -1,7 +1,6 @@
 from __future__ import absolute_import
-from .request_id import RequestID, current_request_id
-from .filters import RequestIDLogFilter
-from . import parser
+import sys
+from importlib import import_module
 
 
 __version__ = '0.0.0-dev'
@@ -13,3 +12,35 @@ __all__ = [
     'RequestIDLogFilter',
     'parser'
 ]
+
+
+# Exports are loaded on first access, so that using only the log filter or the celery
+# extras does not import Flask.
+_LAZY_EXPORTS = {
+    'RequestID': ('.request_id', 'RequestID'),
+    'current_request_id': ('.ctx_fetcher', 'current_request_id'),
+    'RequestIDLogFilter': ('.filters', 'RequestIDLogFilter'),
+    'parser': ('.parser', None),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    module = import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # Module level __getattr__ is not supported (PEP 562)
+    from .request_id import RequestID, current_request_id  # noqa: F401
+    from .filters import RequestIDLogFilter  # noqa: F401
+    from . import parser  # noqa: F401
@@ -0,0 +1,132 @@
+from collections.abc import Mapping
+from urllib.parse import quote, unquote
+
+from .ctx_fetcher import current_request_id
+
+
+MAX_BAGGAGE_ITEMS = 8
+MAX_BAGGAGE_BYTES = 512
+
+
+class Baggage(Mapping):
+    """
+    Small, immutable and size-bounded mapping of tags (tenant, user id etc.) carried along with a request id.
+
+    It is serialized once at creation in a compact `key=value,key=value` form, percent-encoded like the
+    W3C baggage header, which is also its `str()` representation.
+    """
+
+    __slots__ = ('_items', '_serialized')
+
+    def __init__(self, items=()):
+        """
+        Initialize
+        :param Mapping | Iterable items: The tags. Keys and values are converted to strings.
+        :raises ValueError: If there are more than MAX_BAGGAGE_ITEMS tags or the serialized form
+         exceeds MAX_BAGGAGE_BYTES
+        """
+        items = dict((str(key), str(value)) for key, value in dict(items).items())
+        if len(items) > MAX_BAGGAGE_ITEMS:
+            raise ValueError('Baggage can hold up to {} items'.format(MAX_BAGGAGE_ITEMS))
+
+        serialized = ','.join(
+            '{}={}'.format(quote(key, safe=''), quote(value, safe='')) for key, value in sorted(items.items()))
+        if len(serialized) > MAX_BAGGAGE_BYTES:  # Percent-encoded, so it is ASCII
+            raise ValueError('Baggage can be up to {} bytes when serialized'.format(MAX_BAGGAGE_BYTES))
+
+        self._items = items
+        self._serialized = serialized
+
+    @classmethod
+    def parse(cls, value):
+        """
+        Parse the serialized form of baggage as received from a header. Invalid or oversized values are ignored.
+        :param str | None value: The serialized baggage
+        :rtype: Baggage
+        """
+        if not value or len(value) > MAX_BAGGAGE_BYTES:
+            return EMPTY_BAGGAGE
+
+        items = {}
+        for pair in value.split(','):
+            key, sep, item_value = pair.partition('=')
+            if sep and key.strip():
+                items[unquote(key.strip())] = unquote(item_value.strip())
+        try:
+            return cls(items) if items else EMPTY_BAGGAGE
+        except ValueError:
+            return EMPTY_BAGGAGE
+
+    def merge(self, tags):
+        """
+        Get a new baggage with the tags added
+        :param Mapping tags: The tags to add or replace
+        :rtype: Baggage
+        """
+        items = dict(self._items)
+        items.update(tags)
+        return Baggage(items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __str__(self):
+        return self._serialized
+
+    def __repr__(self):
+        return 'Baggage({!r})'.format(self._items)
+
+    def __reduce__(self):
+        return Baggage, (self._items,)
+
+
+EMPTY_BAGGAGE = Baggage()
+
+
+class TaggedRequestId(str):
+    """
+    A request id that carries its baggage, so that both are stored in and fetched from the same context slot.
+    It is a plain string for any code that is not aware of the baggage.
+    """
+
+    def __new__(cls, request_id, baggage):
+        self = super(TaggedRequestId, cls).__new__(cls, request_id)
+        self.baggage = baggage if isinstance(baggage, Baggage) else Baggage(baggage)
+        return self
+
+    def __reduce__(self):
+        return TaggedRequestId, (str(self), self.baggage)
+
+
+def with_baggage(request_id, tags):
+    """
+    Get the request id tagged with the baggage it already carries plus the given tags
+    :param str request_id: The request id
+    :param Mapping tags: The tags to add
+    :rtype: TaggedRequestId
+    :raises ValueError: If the resulting baggage exceeds its limits
+    """
+    return TaggedRequestId(request_id, request_baggage(request_id).merge(tags))
+
+
+def request_baggage(request_id):
+    """
+    Get the baggage carried by a request id
+    :param str | None request_id: The request id
+    :rtype: Baggage
+    """
+    return getattr(request_id, 'baggage', EMPTY_BAGGAGE)
+
+
+def current_request_baggage():
+    """
+    Get the baggage of the current request id
+    :rtype: Baggage
+    """
+    return request_baggage(current_request_id())
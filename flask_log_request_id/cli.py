@@ -0,0 +1,68 @@
+"""
+Command line tool to correlate log files by request id.
+
+    flask-log-request-id --index logs.idx index web.log celery.log.1.gz
+    flask-log-request-id --index logs.idx query 7ff2946c-efe0-4c51-b337-fcdcdfe8397b
+"""
+import argparse
+import sys
+
+from .log_index import LogIndex, DEFAULT_REQUEST_ID_PATTERN
+
+
+def _index(log_index, args):
+    try:
+        count = log_index.update(args.files)
+    except OSError as e:
+        print('flask-log-request-id: {}: {}'.format(e.filename, e.strerror), file=sys.stderr)
+        return 1
+    print('Indexed {} new lines.'.format(count))
+    return 0
+
+
+def _query(log_index, args):
+    if not args.no_update:
+        log_index.update()
+
+    out = getattr(sys.stdout, 'buffer', sys.stdout)
+    for path, line in log_index.lines(args.request_id, include_children=args.include_children):
+        if args.with_filename:
+            out.write(path.encode('utf-8') + b': ')
+        out.write(line)
+    out.flush()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='flask-log-request-id',
+        description='Index log files by request id and fetch all the lines of a request across files.')
+    parser.add_argument('--index', default='request_id.idx', help='The index file (default: %(default)s)')
+    parser.add_argument('--pattern', default=DEFAULT_REQUEST_ID_PATTERN,
+                        help='Regular expression whose first group captures the request id (default: %(default)s)')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    index_parser = subparsers.add_parser('index', help='Add files to the index or index their new lines')
+    index_parser.add_argument('files', nargs='+', help='Log files, plain or gzipped (.gz)')
+    index_parser.set_defaults(handler=_index)
+
+    query_parser = subparsers.add_parser('query', help='Print all lines of a request id in time order')
+    query_parser.add_argument('request_id')
+    query_parser.add_argument('--include-children', action='store_true',
+                              help='Include lines of hierarchical child request ids')
+    query_parser.add_argument('--with-filename', action='store_true', help='Prefix each line with its file')
+    query_parser.add_argument('--no-update', action='store_true',
+                              help='Do not index new lines of the indexed files before querying')
+    query_parser.set_defaults(handler=_query)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with LogIndex(args.index, args.pattern) as log_index:
+        return args.handler(log_index, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
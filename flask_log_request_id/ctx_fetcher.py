@@ -1,3 +1,12 @@
+# Priorities of the built-in contexts, the fetcher with the lowest priority is tried first. The order does not
+# depend on the order the modules are imported, so an eager Celery task within a request gets the request's id
+# and Flask, the most common context, is tried before the threads that were bound explicitly.
+FLASK_CTX_PRIORITY = 10
+CELERY_CTX_PRIORITY = 20
+LOCAL_CTX_PRIORITY = 30
+DEFAULT_CTX_PRIORITY = 100
+
+
 class ExecutedOutsideContext(Exception):
     """
     Exception to be raised if a fetcher was called outside its context
@@ -15,6 +24,7 @@ class MultiContextRequestIdFetcher(object):
         Initialize
         """
         self.ctx_fetchers = []
+        self._priorities = {}
 
     def __call__(self):
 
@@ -25,11 +35,21 @@ class MultiContextRequestIdFetcher(object):
                 continue
         return None
 
-    def register_fetcher(self, ctx_fetcher):
+    def register_fetcher(self, ctx_fetcher, priority=DEFAULT_CTX_PRIORITY):
         """
         Register another context-specialized fetcher
         :param Callable ctx_fetcher: A callable that will return the id or raise ExecutedOutsideContext if it was
          executed outside its context
+        :param int priority: Fetchers with a lower priority are tried first. Fetchers with the same priority are
+         tried in the order they were registered.
         """
         if ctx_fetcher not in self.ctx_fetchers:
+            self._priorities[ctx_fetcher] = priority
             self.ctx_fetchers.append(ctx_fetcher)
+            self.ctx_fetchers.sort(key=self._priorities.__getitem__)  # Stable, keeps the registration order
+
+
+# Fetchers are registered by the modules of each context (Flask, Celery etc.) when they are imported.
+# Every context registers a fetcher on both, so the counter always belongs to the context of the current id.
+current_request_id = MultiContextRequestIdFetcher()
+current_child_counter = MultiContextRequestIdFetcher()
@@ -0,0 +1,31 @@
+from .ctx_fetcher import current_request_id
+
+
+EXCEPTION_ATTRIBUTE = 'log_request_id'
+_MISSING = object()
+
+
+def attach_request_id(exception, request_id):
+    """
+    Attach the request id to an exception object, so that error handlers and reporters can read it
+    without fetching it again. An already attached id is replaced, as the same exception instance
+    may be raised again in another request.
+    :param BaseException exception: The exception
+    :param str | None request_id: The request id
+    """
+    try:
+        setattr(exception, EXCEPTION_ATTRIBUTE, request_id)
+    except AttributeError:
+        pass  # Exceptions with __slots__ can not be enriched
+
+
+def exception_request_id(exception):
+    """
+    Get the request id attached to an exception, or the current request id if nothing is attached.
+    :param BaseException exception: The exception
+    :rtype: str | None
+    """
+    request_id = getattr(exception, EXCEPTION_ATTRIBUTE, _MISSING)
+    if request_id is _MISSING:
+        return current_request_id()
+    return request_id
@@ -1,21 +1,42 @@
 from celery import current_task, signals
+import itertools
 import logging as _logging
 
-from ..request_id import current_request_id
-from ..ctx_fetcher import ExecutedOutsideContext
+from ..hierarchy import child_request_id
+from ..baggage import Baggage, with_baggage
+from ..ctx_fetcher import (ExecutedOutsideContext, current_request_id, current_child_counter,
+                           CELERY_CTX_PRIORITY)
 
 
 _CELERY_X_HEADER = 'x_request_id'
+_CELERY_BAGGAGE_HEADER = 'x_request_baggage'
+_CELERY_CHILD_COUNTER_ATTRIBUTE = 'x_request_id_child_counter'
 logger = _logging.getLogger(__name__)
 
 
-def enable_request_id_propagation(celery_app):
+def enable_request_id_propagation(celery_app, hierarchical=False):
     """
     Will attach signal on celery application in order to propagate
     current request id to workers
     :param celery_app: The celery application
+    :param bool hierarchical: If True, each published task will get its own child request id
+     (e.g. `root.1`, `root.2`) instead of the identical id of the publisher.
     """
-    signals.before_task_publish.connect(on_before_publish_insert_request_id_header)
+    if hierarchical:
+        signals.before_task_publish.connect(on_before_publish_insert_child_request_id_header)
+    else:
+        signals.before_task_publish.connect(on_before_publish_insert_request_id_header)
+    signals.task_prerun.connect(on_task_prerun_attach_request_baggage)
+
+
+def _insert_request_id_headers(headers, request_id):
+    # Plain strings only, as serializers may check exact types. The baggage travels in its own header.
+    if request_id is None:
+        return
+    headers[_CELERY_X_HEADER] = str(request_id)
+    baggage = getattr(request_id, 'baggage', None)
+    if baggage:
+        headers[_CELERY_BAGGAGE_HEADER] = str(baggage)
 
 
 def on_before_publish_insert_request_id_header(headers, **kwargs):
@@ -26,10 +47,36 @@ def on_before_publish_insert_request_id_header(headers, **kwargs):
     """
     if _CELERY_X_HEADER not in headers:
         request_id = current_request_id()
-        headers[_CELERY_X_HEADER] = request_id
+        _insert_request_id_headers(headers, request_id)
         logger.debug("Forwarding request_id '{}' to the task consumer.".format(request_id))
 
 
+def on_before_publish_insert_child_request_id_header(headers, **kwargs):
+    """
+    This function is meant to be used as signal processor for "before_task_publish" in hierarchical mode.
+    :param Dict headers: The headers of the message
+    :param kwargs: Any extra keyword arguments
+    """
+    if _CELERY_X_HEADER not in headers:
+        request_id = child_request_id()
+        _insert_request_id_headers(headers, request_id)
+        logger.debug("Forwarding child request_id '{}' to the task consumer.".format(request_id))
+
+
+def on_task_prerun_attach_request_baggage(task=None, **kwargs):
+    """
+    This function is meant to be used as signal processor for "task_prerun".
+    It parses the baggage header once per task and attaches it to the request id of the task.
+    :param celery.Task task: The task that is about to run
+    :param kwargs: Any extra keyword arguments
+    """
+    task_request = task.request
+    request_id = task_request.get(_CELERY_X_HEADER, None)
+    baggage = Baggage.parse(task_request.get(_CELERY_BAGGAGE_HEADER, None))
+    if request_id is not None and baggage:
+        setattr(task_request, _CELERY_X_HEADER, with_baggage(request_id, baggage))
+
+
 def ctx_celery_task_get_request_id():
     """
     Fetch the request id from the headers of the current celery task.
@@ -40,5 +87,21 @@ def ctx_celery_task_get_request_id():
     return current_task.request.get(_CELERY_X_HEADER, None)
 
 
+def ctx_celery_task_get_child_counter():
+    """
+    Fetch the counter of child request ids of the current celery task. It is created on first use.
+    """
+    if current_task._get_current_object() is None:
+        raise ExecutedOutsideContext()
+
+    task_request = current_task.request
+    counter = getattr(task_request, _CELERY_CHILD_COUNTER_ATTRIBUTE, None)
+    if counter is None:
+        counter = itertools.count(1)
+        setattr(task_request, _CELERY_CHILD_COUNTER_ATTRIBUTE, counter)
+    return counter
+
+
 # If you import this module then you are interested for this context
-current_request_id.register_fetcher(ctx_celery_task_get_request_id)
+current_request_id.register_fetcher(ctx_celery_task_get_request_id, CELERY_CTX_PRIORITY)
+current_child_counter.register_fetcher(ctx_celery_task_get_child_counter, CELERY_CTX_PRIORITY)
@@ -0,0 +1,22 @@
+from ..propagation import inject, consumer
+
+
+def publish(producer, body, hierarchical=False, **kwargs):
+    """
+    Publish a message with kombu, forwarding the current request id in the message headers
+    :param kombu.Producer producer: The producer to publish with
+    :param body: The body of the message
+    :param bool hierarchical: If True, the message will get a child id of the current request id
+    :param kwargs: Any extra keyword arguments of `kombu.Producer.publish()`
+    """
+    kwargs['headers'] = inject(dict(kwargs.get('headers') or {}), hierarchical=hierarchical)
+    return producer.publish(body, **kwargs)
+
+
+def _message_headers(*args, **kwargs):
+    # Kombu callbacks are called with (body, message)
+    return args[-1].headers
+
+
+# Decorator for kombu consumer callbacks, that binds the request id of the message while the callback runs
+request_id_consumer = consumer(_message_headers)
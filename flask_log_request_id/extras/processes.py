@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from ..ctx_fetcher import current_request_id
+from ..hierarchy import child_request_id
+from ..local import bind_request_id
+
+
+class RequestIDTask(object):
+    """
+    A picklable callable that carries a request id along with the function to call.
+
+    It is sent to the child process as part of the task payload and binds the request id there
+    while the function runs, so `current_request_id()` and `RequestIDLogFilter` work unchanged.
+    It does not rely on inherited state, therefore it works with both "fork" and "spawn" start methods.
+    """
+
+    def __init__(self, fn, request_id):
+        """
+        Initialize
+        :param Callable fn: A picklable callable, e.g. a module level function
+        :param str | None request_id: The request id to bind in the child process
+        """
+        self.fn = fn
+        self.request_id = request_id
+
+    def __call__(self, *args, **kwargs):
+        with bind_request_id(self.request_id):
+            return self.fn(*args, **kwargs)
+
+
+def with_request_id(fn, hierarchical=False):
+    """
+    Wrap a function so that it will run with the current request id, even in another process.
+    It can be used with any process pool e.g. `multiprocessing.Pool.apply_async(with_request_id(fn), args)`
+
+    A child process can not share the counter of child ids with its parent. Sibling tasks that run with the
+    same request id will generate the same child ids, so use `hierarchical=True` if tasks generate child ids.
+    :param Callable fn: A picklable callable
+    :param bool hierarchical: If True, the task will run with its own child id of the current request id
+    :rtype: RequestIDTask
+    """
+    return RequestIDTask(fn, child_request_id() if hierarchical else current_request_id())
+
+
+class RequestIDProcessPoolExecutor(ProcessPoolExecutor):
+    """
+    A ProcessPoolExecutor that propagates the request id of the submitter to the task.
+    """
+
+    def __init__(self, *args, hierarchical=False, **kwargs):
+        """
+        Initialize
+        :param bool hierarchical: If True, each submitted task will run with its own child id (e.g. `root.1`,
+         `root.2`) instead of the identical id of the submitter.
+        :param args: Any arguments of ProcessPoolExecutor
+        :param kwargs: Any keyword arguments of ProcessPoolExecutor
+        """
+        super(RequestIDProcessPoolExecutor, self).__init__(*args, **kwargs)
+        self._hierarchical = hierarchical
+
+    def submit(self, fn, *args, **kwargs):
+        return super(RequestIDProcessPoolExecutor, self).submit(
+            with_request_id(fn, self._hierarchical), *args, **kwargs)
@@ -0,0 +1,51 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from ..ctx_fetcher import current_request_id
+from ..hierarchy import child_request_id
+from ..local import bind_request_id
+
+
+def _call_with_request_id(request_id, fn, args, kwargs):
+    with bind_request_id(request_id):
+        return fn(*args, **kwargs)
+
+
+def copy_request_context(fn, hierarchical=False):
+    """
+    Decorator that captures the current request id at decoration time and binds it
+    while the decorated function runs, even if it runs in another thread.
+    :param Callable fn: The function to decorate
+    :param bool hierarchical: If True, the function will run with its own child id of the current request id
+    :return: The decorated function
+    """
+    request_id = child_request_id() if hierarchical else current_request_id()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return _call_with_request_id(request_id, fn, args, kwargs)
+    return wrapper
+
+
+class RequestIDThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    A ThreadPoolExecutor that propagates the request id of the submitter to the task.
+
+    The id is captured at submit time and bound in the worker thread for the duration of the task,
+    so `current_request_id()` and `RequestIDLogFilter` work inside the task without an application context.
+    """
+
+    def __init__(self, *args, hierarchical=False, **kwargs):
+        """
+        Initialize
+        :param bool hierarchical: If True, each submitted task will run with its own child id (e.g. `root.1`,
+         `root.2`) instead of the identical id of the submitter.
+        :param args: Any arguments of ThreadPoolExecutor
+        :param kwargs: Any keyword arguments of ThreadPoolExecutor
+        """
+        super(RequestIDThreadPoolExecutor, self).__init__(*args, **kwargs)
+        self._hierarchical = hierarchical
+
+    def submit(self, fn, *args, **kwargs):
+        request_id = child_request_id() if self._hierarchical else current_request_id()
+        return super(RequestIDThreadPoolExecutor, self).submit(_call_with_request_id, request_id, fn, args, kwargs)
@@ -1,12 +1,22 @@
 import logging
-from .request_id import current_request_id
+from .ctx_fetcher import current_request_id
+from .exceptions import EXCEPTION_ATTRIBUTE
+from .baggage import EMPTY_BAGGAGE
 
 
 class RequestIDLogFilter(logging.Filter):
     """
-    Log filter to inject the current request id of the request under `log_record.request_id`
+    Log filter to inject the current request id of the request under `log_record.request_id` and
+    its baggage under `log_record.request_baggage`
+
+    If there is no current request id but the record holds an exception with an attached request id,
+    e.g. when an error reporter logs it later from another thread, the attached id is used.
     """
 
     def filter(self, log_record):
         log_record.request_id = current_request_id()
+        exc_info = log_record.exc_info
+        if log_record.request_id is None and exc_info:
+            log_record.request_id = getattr(exc_info[1], EXCEPTION_ATTRIBUTE, None)
+        log_record.request_baggage = getattr(log_record.request_id, 'baggage', EMPTY_BAGGAGE)
         return log_record
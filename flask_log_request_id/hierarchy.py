@@ -0,0 +1,53 @@
+import itertools
+
+from .ctx_fetcher import current_request_id, current_child_counter
+from .baggage import TaggedRequestId
+
+
+SEPARATOR = '.'
+_fallback_child_counter = itertools.count(1)
+
+
+def child_request_id():
+    """
+    Generate the id of a child of the current request, e.g. for a task that is published or an outbound call.
+
+    The child id is the current id with a numeric suffix, like `root.1` and at the next level `root.1.3`.
+    The suffix comes from a counter of the current context, so siblings get distinct ids.
+    The child id carries the baggage of the current id.
+    :return: The child id or None if there is no current request id
+    :rtype: str | None
+    """
+    request_id = current_request_id()
+    if request_id is None:
+        return None
+
+    counter = current_child_counter()
+    if counter is None:
+        counter = _fallback_child_counter
+    child_id = '{}{}{}'.format(request_id, SEPARATOR, next(counter))
+
+    baggage = getattr(request_id, 'baggage', None)
+    if baggage:
+        return TaggedRequestId(child_id, baggage)
+    return child_id
+
+
+def root_request_id(request_id):
+    """
+    Get the root of a hierarchical request id, to be used for grouping. Note that a root id
+    that contains the separator itself, will be cut at the first separator.
+    :param str | None request_id: A request id as generated by `child_request_id()`
+    :rtype: str | None
+    """
+    if request_id is None:
+        return None
+    return request_id.split(SEPARATOR, 1)[0]
+
+
+def current_root_request_id():
+    """
+    Get the root of the current request id
+    :rtype: str | None
+    """
+    return root_request_id(current_request_id())
@@ -0,0 +1,69 @@
+import itertools
+import threading
+
+from .ctx_fetcher import (ExecutedOutsideContext, current_request_id, current_child_counter,
+                          LOCAL_CTX_PRIORITY)
+
+
+_local = threading.local()
+
+
+def local_ctx_get_request_id():
+    """
+    Get the request id that was explicitly bound to the current thread
+    :return: The id or None if it was bound as None.
+    """
+    binding = getattr(_local, 'binding', None)
+    if binding is None:
+        raise ExecutedOutsideContext()
+
+    return binding.request_id
+
+
+def local_ctx_get_child_counter():
+    """
+    Get the counter of child request ids for the request id bound to the current thread
+    :rtype: itertools.count
+    """
+    binding = getattr(_local, 'binding', None)
+    if binding is None:
+        raise ExecutedOutsideContext()
+
+    if binding.child_counter is None:
+        binding.child_counter = itertools.count(1)
+    return binding.child_counter
+
+
+current_request_id.register_fetcher(local_ctx_get_request_id, LOCAL_CTX_PRIORITY)
+current_child_counter.register_fetcher(local_ctx_get_child_counter, LOCAL_CTX_PRIORITY)
+
+
+class bind_request_id(object):
+    """
+    Context manager that binds a request id to the current thread for the duration of the block.
+
+    It is the cheap alternative of pushing a whole Flask application context in threads that
+    run outside of the request, like the workers of a thread pool. The previous binding, if any,
+    is restored on exit so that blocks can be nested.
+    """
+
+    __slots__ = ('request_id', 'child_counter', '_previous')
+
+    def __init__(self, request_id):
+        """
+        Initialize
+        :param str | None request_id: The request id to bind
+        """
+        self.request_id = request_id
+        self.child_counter = None  # Created on first use by `local_ctx_get_child_counter()`
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_local, 'binding', None)
+        _local.binding = self
+        return self.request_id
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _local.binding = self._previous
+        self._previous = None
+        return False
@@ -0,0 +1,300 @@
+import gzip
+import mmap
+import os
+import re
+import sqlite3
+
+
+DEFAULT_REQUEST_ID_PATTERN = r'request_id=([^\s,;]+)'
+_TIMESTAMP_RE = re.compile(br'\[?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)')
+_HEAD_SIZE = 256
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    head BLOB NOT NULL,
+    indexed_offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    request_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_request_id ON entries (request_id);
+'''
+
+
+def _is_gzip(path):
+    return path.endswith('.gz')
+
+
+def _read_head(path):
+    with open(path, 'rb') as f:
+        return f.read(_HEAD_SIZE)
+
+
+def _read_gzip_lines(path, offsets):
+    """
+    Read the lines at the given offsets of a gzipped file in a single pass. A gzip stream can not seek
+    backwards without decompressing again from the start, so offsets are visited in ascending order.
+    :param str path: The path of the gzipped file
+    :param Iterable[int] offsets: Offsets in the decompressed stream
+    :return: The lines by offset
+    :rtype: dict[int, bytes]
+    """
+    lines = {}
+    with gzip.open(path, 'rb') as f:
+        for offset in sorted(set(offsets)):
+            f.seek(offset)
+            lines[offset] = f.readline()
+    return lines
+
+
+class _Scan(object):
+    """
+    Iterable over the (request_id, timestamp, offset) entries that a scanner generator yields, that keeps the
+    offset the scanner returns once it is exhausted, i.e. where the next update should start from.
+    """
+
+    def __init__(self, scanner):
+        self._scanner = scanner
+        self.offset = None
+
+    def __iter__(self):
+        self.offset = yield from self._scanner
+
+
+class LogIndex(object):
+    """
+    On-disk index of log files from request id to the byte offsets of the lines that hold it.
+
+    Plain files are scanned through memory-mapped reads and only the part that was appended since the
+    last update is scanned again. Gzipped files are streamed and re-indexed from the start whenever they change.
+    Offsets of gzipped files refer to the decompressed stream, so reading the lines of a request from a gzipped file
+    decompresses it up to the last of those lines, once per query.
+    """
+
+    def __init__(self, index_path, request_id_pattern=DEFAULT_REQUEST_ID_PATTERN):
+        """
+        Initialize
+        :param str index_path: The path of the index file. It will be created if it does not exist.
+        :param str request_id_pattern: A regular expression whose first group captures the request id of a log line
+        """
+        self._db = sqlite3.connect(index_path)
+        self._db.executescript(_SCHEMA)
+        self._request_id_re = re.compile(request_id_pattern.encode('utf-8'))
+
+        stored_pattern = self._db.execute("SELECT value FROM meta WHERE key = 'pattern'").fetchone()
+        if stored_pattern is None or stored_pattern[0] != request_id_pattern:
+            # Entries indexed with another pattern cannot be trusted
+            with self._db:
+                self._db.execute('DELETE FROM entries')
+                self._db.execute('DELETE FROM files')
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('pattern', ?)",
+                                 (request_id_pattern,))
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    @property
+    def paths(self):
+        """
+        The paths of all indexed files
+        :rtype: list[str]
+        """
+        return [row[0] for row in self._db.execute('SELECT path FROM files ORDER BY path')]
+
+    def update(self, paths=None):
+        """
+        Index the new content of the given files
+        :param Iterable[str] | None paths: The files to index. If None, all the already indexed files will be updated
+         and those that no longer exist, e.g. rotated away, are removed from the index along with their entries.
+        :return: The number of new lines that were indexed
+        :rtype: int
+        :raises FileNotFoundError: If any of the given files does not exist. Nothing is indexed in this case.
+        """
+        if paths is None:
+            return sum(self._update_file(path) for path in self.paths)
+
+        paths = [os.path.abspath(path) for path in paths]
+        for path in paths:
+            os.stat(path)  # Fail early on a misspelled path
+        return sum(self._update_file(path) for path in paths)
+
+    def _remove_file(self, path):
+        with self._db:
+            self._db.execute('DELETE FROM entries WHERE file_id IN (SELECT id FROM files WHERE path = ?)', (path,))
+            self._db.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def _update_file(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._remove_file(path)
+            return 0
+
+        row = self._db.execute(
+            'SELECT id, size, mtime, head, indexed_offset FROM files WHERE path = ?', (path,)).fetchone()
+
+        if row is not None:
+            file_id, size, mtime, head, start = row
+            if size == stat.st_size and mtime == stat.st_mtime:
+                return 0
+            if _is_gzip(path) or stat.st_size < start or _read_head(path)[:len(head)] != head:
+                # Rotated, truncated or compressed file, start over
+                start = 0
+        else:
+            file_id, start = None, 0
+
+        with self._db:
+            if file_id is None:
+                file_id = self._db.execute(
+                    'INSERT INTO files (path, size, mtime, head, indexed_offset) VALUES (?, 0, 0, ?, 0)',
+                    (path, b'')).lastrowid
+            elif start == 0:
+                self._db.execute('DELETE FROM entries WHERE file_id = ?', (file_id,))
+
+            scan = _Scan(self._scan_gzip(path) if _is_gzip(path) else self._scan_plain(path, start))
+            count = self._db.executemany(
+                'INSERT INTO entries (request_id, ts, file_id, offset) VALUES (?, ?, ?, ?)',
+                ((request_id, ts, file_id, offset) for request_id, ts, offset in scan)).rowcount
+            self._db.execute(
+                'UPDATE files SET size = ?, mtime = ?, head = ?, indexed_offset = ? WHERE id = ?',
+                (stat.st_size, stat.st_mtime, _read_head(path), scan.offset, file_id))
+
+        return count
+
+    def _match_line(self, buf, line_start, line_end):
+        """
+        :return: A tuple of (request_id, timestamp) or None if the line does not hold a request id
+        """
+        match = self._request_id_re.search(buf, line_start, line_end)
+        if match is None:
+            return None
+        request_id = match.group(1).decode('utf-8', 'replace')
+        if request_id == 'None':
+            return None
+
+        ts_match = _TIMESTAMP_RE.match(buf, line_start, line_end)
+        ts = ts_match.group(1).decode('ascii').replace(',', '.').replace('T', ' ') if ts_match else ''
+        return request_id, ts
+
+    def _scan_plain(self, path, start):
+        """
+        Generator of the entries of a plain file from the given offset on
+        :return: The offset after the last complete line
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= start:
+                return start
+
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                # Only complete lines are indexed, the rest will be picked up by the next update
+                end = mm.rfind(b'\n', start) + 1
+                if end <= start:
+                    return start
+
+                last_line_start = -1
+                for match in self._request_id_re.finditer(mm, start, end):
+                    line_start = max(mm.rfind(b'\n', start, match.start()) + 1, start)
+                    if line_start == last_line_start:
+                        continue
+                    last_line_start = line_start
+
+                    found = self._match_line(mm, line_start, mm.find(b'\n', match.end(), end))
+                    if found is not None:
+                        yield found + (line_start,)
+            finally:
+                mm.close()
+        return end
+
+    def _scan_gzip(self, path):
+        """
+        Generator of the entries of a gzipped file
+        :return: The offset in the decompressed stream after the last complete line
+        """
+        offset = 0
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                found = self._match_line(line, 0, len(line))
+                if found is not None:
+                    yield found + (offset,)
+                offset += len(line)
+        return offset
+
+    def lookup(self, request_id, include_children=False):
+        """
+        Find all the lines of a request id in time order across files
+        :param str request_id: The request id to look for
+        :param bool include_children: If True, the lines of hierarchical child ids (e.g. `root.1.3`) are included
+        :return: A list of (path, offset) tuples
+        :rtype: list[(str, int)]
+        """
+        query = ('SELECT files.path, entries.offset FROM entries JOIN files ON files.id = entries.file_id '
+                 'WHERE entries.request_id = ? {} ORDER BY entries.ts, files.path, entries.offset')
+        if include_children:
+            # Children are in the range ['root.', 'root/') as '/' is the character that follows '.'
+            return self._db.execute(
+                query.format('OR (entries.request_id >= ? AND entries.request_id < ?)'),
+                (request_id, request_id + '.', request_id + '/')).fetchall()
+        return self._db.execute(query.format(''), (request_id,)).fetchall()
+
+    def lines(self, request_id, include_children=False):
+        """
+        Read all the lines of a request id in time order across files. Lines of files that no longer exist are skipped.
+        :param str request_id: The request id to look for
+        :param bool include_children: If True, the lines of hierarchical child ids are included
+        :return: A generator of (path, line) tuples
+        """
+        entries = self.lookup(request_id, include_children)
+
+        gzip_offsets = {}
+        for path, offset in entries:
+            if _is_gzip(path):
+                gzip_offsets.setdefault(path, []).append(offset)
+        gzip_lines = {}
+        for path, offsets in gzip_offsets.items():
+            try:
+                gzip_lines[path] = _read_gzip_lines(path, offsets)
+            except FileNotFoundError:
+                pass
+
+        files = {}
+        try:
+            for path, offset in entries:
+                if path in gzip_offsets:
+                    if path in gzip_lines:
+                        yield path, gzip_lines[path][offset]
+                    continue
+
+                if path not in files:
+                    try:
+                        files[path] = open(path, 'rb')
+                    except FileNotFoundError:
+                        files[path] = None
+                f = files[path]
+                if f is None:
+                    continue
+                f.seek(offset)
+                yield path, f.readline()
+        finally:
+            for f in files.values():
+                if f is not None:
+                    f.close()
@@ -0,0 +1,103 @@
+import collections
+import functools
+import queue
+
+from .ctx_fetcher import current_request_id
+from .hierarchy import child_request_id
+from .baggage import Baggage, TaggedRequestId
+from .local import bind_request_id
+
+
+REQUEST_ID_HEADER = 'x_request_id'
+REQUEST_BAGGAGE_HEADER = 'x_request_baggage'
+
+
+def inject(headers, header_name=REQUEST_ID_HEADER, hierarchical=False, baggage_header_name=REQUEST_BAGGAGE_HEADER):
+    """
+    Insert the current request id and its baggage, if any, in the headers of an outgoing message or HTTP call.
+    An already present id is not overwritten.
+    :param dict headers: The headers of the message, or any mutable mapping like the fields of a redis stream entry
+    :param str header_name: The name of the header
+    :param bool hierarchical: If True, a child id of the current request id will be inserted
+    :param str baggage_header_name: The name of the header for the baggage
+    :return: The same headers
+    :rtype: dict
+    """
+    if header_name not in headers:
+        request_id = child_request_id() if hierarchical else current_request_id()
+        if request_id is not None:
+            headers[header_name] = str(request_id)
+            baggage = getattr(request_id, 'baggage', None)
+            if baggage:
+                headers[baggage_header_name] = str(baggage)
+    return headers
+
+
+def _get_header(headers, name):
+    # Clients like redis-py return the fields of stream entries as bytes, unless told to decode them
+    value = headers.get(name, None)
+    if value is None:
+        value = headers.get(name.encode('utf-8'), None)
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'replace')
+    return value
+
+
+def extract(headers, header_name=REQUEST_ID_HEADER, baggage_header_name=REQUEST_BAGGAGE_HEADER):
+    """
+    Get the request id, along with its baggage, from the headers of an incoming message
+    :param dict | None headers: The headers of the message. Keys and values can be either strings or bytes.
+    :param str header_name: The name of the header
+    :param str baggage_header_name: The name of the header for the baggage
+    :rtype: str | TaggedRequestId | None
+    """
+    if not headers:
+        return None
+
+    request_id = _get_header(headers, header_name)
+    if request_id is not None:
+        baggage = Baggage.parse(_get_header(headers, baggage_header_name))
+        if baggage:
+            return TaggedRequestId(request_id, baggage)
+    return request_id
+
+
+def consumer(get_headers, header_name=REQUEST_ID_HEADER, baggage_header_name=REQUEST_BAGGAGE_HEADER):
+    """
+    A decorator factory for message handlers, that binds the request id of the message for the handler's lifetime
+    :param Callable get_headers: A callable that will be called with the arguments of the handler and must
+     return the headers of the message
+    :param str header_name: The name of the header
+    :param str baggage_header_name: The name of the header for the baggage
+    :return: A decorator for message handlers
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with bind_request_id(extract(get_headers(*args, **kwargs), header_name, baggage_header_name)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+Message = collections.namedtuple('Message', ['headers', 'body'])
+
+
+class RequestIDQueue(queue.Queue):
+    """
+    An in-memory queue that carries the request id of the producer along with each item.
+
+    Items are retrieved as `Message(headers, body)` tuples, to be handled by a `queue_consumer` handler.
+    """
+
+    def put(self, item, block=True, timeout=None):
+        super(RequestIDQueue, self).put(Message(inject({}), item), block, timeout)
+
+
+def _queue_message_headers(*args, **kwargs):
+    # Handlers are called with the `Message` as their last argument
+    return args[-1].headers
+
+
+# Decorator for handlers of `RequestIDQueue` messages, that binds the request id of the message while the handler runs
+queue_consumer = consumer(_queue_message_headers)
@@ -1,10 +1,16 @@
+import functools
+import itertools
 import uuid
 import logging as _logging
 
 from flask import request, g, current_app
 
 from .parser import auto_parser
-from .ctx_fetcher import MultiContextRequestIdFetcher, ExecutedOutsideContext
+from .ctx_fetcher import (ExecutedOutsideContext, current_request_id, current_child_counter,
+                          FLASK_CTX_PRIORITY)
+from .exceptions import attach_request_id
+from .baggage import Baggage, TaggedRequestId, with_baggage
+from . import local  # noqa: F401  Binding to threads is supported along with Flask, tried after it
 
 
 logger = _logging.getLogger(__name__)
@@ -24,8 +30,98 @@ def flask_ctx_get_request_id():
     return g.get(g_object_attr, None)
 
 
-current_request_id = MultiContextRequestIdFetcher()
-current_request_id.register_fetcher(flask_ctx_get_request_id)
+def flask_ctx_get_child_counter():
+    """
+    Get the counter of child request ids from flask's G object. It is created on first use.
+    :rtype: itertools.count
+    """
+    from flask import _app_ctx_stack as stack  # We do not support < Flask 0.9
+
+    if stack.top is None:
+        raise ExecutedOutsideContext()
+
+    g_object_attr = stack.top.app.config['LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE'] + '_child_counter'
+    counter = g.get(g_object_attr, None)
+    if counter is None:
+        counter = itertools.count(1)
+        setattr(g, g_object_attr, counter)
+    return counter
+
+
+current_request_id.register_fetcher(flask_ctx_get_request_id, FLASK_CTX_PRIORITY)
+current_child_counter.register_fetcher(flask_ctx_get_child_counter, FLASK_CTX_PRIORITY)
+
+
+def _attach_request_id_before_handling(app):
+    """
+    Wrap `Flask.handle_exception` of the application, so that the request id is attached on the exception
+    before "got_request_exception" is sent. Blinker does not call receivers in connection order, so
+    connecting a receiver of our own would not guarantee that error reporters see the id.
+    :param flask.Flask app: The application
+    """
+    handle_exception = app.handle_exception
+
+    @functools.wraps(handle_exception)
+    def _handle_exception_attach_request_id(e):
+        attach_request_id(e, g.get(app.config['LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE'], None))
+        return handle_exception(e)
+
+    app.handle_exception = _handle_exception_attach_request_id
+
+
+def add_request_baggage(**tags):
+    """
+    Add tags to the baggage of the current Flask request id, e.g. the tenant once the user is authenticated.
+    The tags will be attached to log records by RequestIDLogFilter and propagated along with the id.
+    :return: The request id with its new baggage, or None if there is no request id
+    :rtype: TaggedRequestId | None
+    :raises ValueError: If the baggage exceeds its size limits
+    """
+    g_object_attr = current_app.config['LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE']
+    request_id = g.get(g_object_attr, None)
+    if request_id is None:
+        return None
+
+    request_id = with_baggage(request_id, tags)
+    setattr(g, g_object_attr, request_id)
+    return request_id
+
+
+def _as_str_collection(value):
+    """
+    Normalize a configuration value that may be a single string or a collection of strings
+    :rtype: tuple[str]
+    """
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def _compile_exclusion_matcher(endpoints, path_prefixes, methods):
+    """
+    Compile the exclusion rules into a single matcher, so that no rule has to be parsed per request
+    :param str | Iterable[str] endpoints: Names of the endpoints to exclude
+    :param str | Iterable[str] path_prefixes: Prefixes of the request paths to exclude
+    :param str | Iterable[str] methods: HTTP methods to exclude
+    :return: A callable that returns True if the current request is excluded, or None if nothing is excluded
+    :rtype: None | ()->bool
+    """
+    endpoints = frozenset(_as_str_collection(endpoints))
+    path_prefixes = tuple(sorted(set(_as_str_collection(path_prefixes))))
+    methods = frozenset(method.upper() for method in _as_str_collection(methods))
+
+    if not (endpoints or path_prefixes or methods):
+        return None
+
+    def is_excluded():
+        return (
+            request.method in methods
+            or request.endpoint in endpoints
+            or (bool(path_prefixes) and request.path.startswith(path_prefixes))
+        )
+    return is_excluded
 
 
 class RequestID(object):
@@ -63,6 +159,22 @@ class RequestID(object):
         app.config.setdefault('LOG_REQUEST_ID_GENERATE_IF_NOT_FOUND', True)
         app.config.setdefault('LOG_REQUEST_ID_LOG_ALL_REQUESTS', False)
         app.config.setdefault('LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE', 'log_request_id')
+        app.config.setdefault('LOG_REQUEST_ID_RESPONSE_HEADER', None)
+        app.config.setdefault('LOG_REQUEST_ID_ATTACH_TO_EXCEPTIONS', False)
+        app.config.setdefault('LOG_REQUEST_ID_BAGGAGE_HEADER', None)
+        app.config.setdefault('LOG_REQUEST_ID_EXCLUDE_ENDPOINTS', ())
+        app.config.setdefault('LOG_REQUEST_ID_EXCLUDE_PATH_PREFIXES', ())
+        app.config.setdefault('LOG_REQUEST_ID_EXCLUDE_METHODS', ())
+
+        is_excluded = _compile_exclusion_matcher(
+            app.config['LOG_REQUEST_ID_EXCLUDE_ENDPOINTS'],
+            app.config['LOG_REQUEST_ID_EXCLUDE_PATH_PREFIXES'],
+            app.config['LOG_REQUEST_ID_EXCLUDE_METHODS'])
+
+        if app.config['LOG_REQUEST_ID_ATTACH_TO_EXCEPTIONS']:
+            _attach_request_id_before_handling(app)
+
+        baggage_header = app.config['LOG_REQUEST_ID_BAGGAGE_HEADER']
 
         # Register before request callback
         @app.before_request
@@ -73,6 +185,9 @@ class RequestID(object):
 
             To be used as a consumer of Flask.before_request event.
             """
+            if is_excluded is not None and is_excluded():
+                return
+
             g_object_attr = current_app.config['LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE']
 
             setattr(g, g_object_attr, self._request_id_parser())
@@ -80,9 +195,35 @@ class RequestID(object):
                 if app.config['LOG_REQUEST_ID_GENERATE_IF_NOT_FOUND']:
                     setattr(g, g_object_attr, self._request_id_generator())
 
+            if baggage_header:
+                request_id = g.get(g_object_attr)
+                baggage = Baggage.parse(request.headers.get(baggage_header))
+                if request_id is not None and baggage:
+                    setattr(g, g_object_attr, TaggedRequestId(request_id, baggage))
+
         # Register after request
-        if app.config['LOG_REQUEST_ID_LOG_ALL_REQUESTS']:
-            app.after_request(self._log_http_event)
+        log_all_requests = app.config['LOG_REQUEST_ID_LOG_ALL_REQUESTS']
+        response_header = app.config['LOG_REQUEST_ID_RESPONSE_HEADER']
+        if log_all_requests or response_header:
+            @app.after_request
+            def _finalize_response(response):
+                """
+                It will echo the already resolved request id on the response headers and
+                emit the access log event, depending on the configuration.
+
+                To be used as a consumer of Flask.after_request event.
+                """
+                if is_excluded is not None and is_excluded():
+                    return response
+
+                if response_header:
+                    request_id = g.get(current_app.config['LOG_REQUEST_ID_G_OBJECT_ATTRIBUTE'], None)
+                    if request_id is not None:
+                        response.headers[response_header] = request_id
+
+                if log_all_requests:
+                    self._log_http_event(response)
+                return response
 
     @staticmethod
     def _log_http_event(response):
@@ -132,6 +132,11 @@ setup(
         'test': test_requirements
     },
     test_suite='nose.collector',
+    entry_points={
+        'console_scripts': [
+            'flask-log-request-id = flask_log_request_id.cli:main'
+        ]
+    },
     classifiers=[
         'Environment :: Web Environment', 'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
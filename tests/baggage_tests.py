@@ -0,0 +1,76 @@
+import pickle
+import unittest
+
+from flask_log_request_id.baggage import (Baggage, TaggedRequestId, EMPTY_BAGGAGE, MAX_BAGGAGE_ITEMS,
+                                          MAX_BAGGAGE_BYTES, with_baggage, request_baggage, current_request_baggage)
+from flask_log_request_id.hierarchy import child_request_id
+from flask_log_request_id.local import bind_request_id
+
+
+class BaggageTestCase(unittest.TestCase):
+
+    def test_mapping(self):
+        baggage = Baggage({'tenant': 'acme', 'user': 15})
+        self.assertEqual({'tenant': 'acme', 'user': '15'}, dict(baggage))
+        self.assertEqual('acme', baggage['tenant'])
+        self.assertEqual(2, len(baggage))
+        self.assertFalse(EMPTY_BAGGAGE)
+
+    def test_immutable(self):
+        baggage = Baggage({'tenant': 'acme'})
+        with self.assertRaises(TypeError):
+            baggage['tenant'] = 'other'
+        with self.assertRaises(AttributeError):
+            baggage.other = 'value'
+
+    def test_serialization(self):
+        baggage = Baggage({'user': 'a,b=c', 'tenant': 'acme'})
+        self.assertEqual('tenant=acme,user=a%2Cb%3Dc', str(baggage))
+        self.assertEqual(baggage, Baggage.parse(str(baggage)))
+
+    def test_parse_invalid(self):
+        self.assertIs(EMPTY_BAGGAGE, Baggage.parse(None))
+        self.assertIs(EMPTY_BAGGAGE, Baggage.parse(''))
+        self.assertIs(EMPTY_BAGGAGE, Baggage.parse('novalue,=empty-key'))
+        self.assertEqual({'tenant': 'acme'}, dict(Baggage.parse('novalue, tenant = acme')))
+
+    def test_size_limits(self):
+        with self.assertRaises(ValueError):
+            Baggage(('key{}'.format(i), i) for i in range(MAX_BAGGAGE_ITEMS + 1))
+        with self.assertRaises(ValueError):
+            Baggage({'key': 'v' * MAX_BAGGAGE_BYTES})
+
+        self.assertIs(EMPTY_BAGGAGE, Baggage.parse('key=' + 'v' * MAX_BAGGAGE_BYTES))
+        self.assertIs(EMPTY_BAGGAGE, Baggage.parse(','.join('k{}=v'.format(i) for i in range(MAX_BAGGAGE_ITEMS + 1))))
+
+    def test_tagged_request_id(self):
+        request_id = with_baggage('abc-123', {'tenant': 'acme'})
+        self.assertEqual('abc-123', request_id)
+        self.assertIsInstance(request_id, str)
+        self.assertEqual({'tenant': 'acme'}, dict(request_baggage(request_id)))
+
+        request_id = with_baggage(request_id, {'user': '15'})
+        self.assertEqual({'tenant': 'acme', 'user': '15'}, dict(request_baggage(request_id)))
+
+        self.assertIs(EMPTY_BAGGAGE, request_baggage('abc-123'))
+        self.assertIs(EMPTY_BAGGAGE, request_baggage(None))
+
+    def test_tagged_request_id_is_picklable(self):
+        request_id = pickle.loads(pickle.dumps(TaggedRequestId('abc-123', {'tenant': 'acme'})))
+        self.assertEqual('abc-123', request_id)
+        self.assertEqual({'tenant': 'acme'}, dict(request_id.baggage))
+
+    def test_current_request_baggage(self):
+        self.assertIs(EMPTY_BAGGAGE, current_request_baggage())
+        with bind_request_id(with_baggage('abc-123', {'tenant': 'acme'})):
+            self.assertEqual({'tenant': 'acme'}, dict(current_request_baggage()))
+
+    def test_child_request_id_carries_baggage(self):
+        with bind_request_id(with_baggage('abc-123', {'tenant': 'acme'})):
+            child = child_request_id()
+        self.assertEqual('abc-123.1', child)
+        self.assertEqual({'tenant': 'acme'}, dict(request_baggage(child)))
+
+
+if __name__ == '__main__':
+    unittest.main()
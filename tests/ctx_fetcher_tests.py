@@ -64,6 +64,20 @@ class CtxFetcherTestCase(unittest.TestCase):
             [fetcher1]
         )
 
+    def test_register_fetcher_priority(self):
+        multi_fetcher = MultiContextRequestIdFetcher()
+
+        fetcher1, fetcher2, fetcher3 = mock.Mock(), mock.Mock(), mock.Mock()
+        multi_fetcher.register_fetcher(fetcher1)
+        multi_fetcher.register_fetcher(fetcher2, priority=20)
+        multi_fetcher.register_fetcher(fetcher3, priority=10)
+        self.assertEqual(
+            multi_fetcher.ctx_fetchers,
+            [fetcher3, fetcher2, fetcher1]
+        )
+
+        fetcher3.return_value = 'fetcher:3'
+        self.assertEqual(multi_fetcher(), 'fetcher:3')
 
 
 if __name__ == '__main__':
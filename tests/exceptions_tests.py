@@ -0,0 +1,161 @@
+import logging
+import unittest
+
+import flask
+
+from flask_log_request_id import RequestID, RequestIDLogFilter
+from flask_log_request_id.exceptions import attach_request_id, exception_request_id
+from flask_log_request_id.local import bind_request_id
+
+
+class StandInReporter(object):
+    """
+    Minimal error reporter that hooks on "got_request_exception" like Sentry's Flask integration does,
+    i.e. without a sender.
+    """
+
+    def __init__(self):
+        self.reported = []
+        flask.got_request_exception.connect(self.on_exception, weak=False)
+
+    def close(self):
+        flask.got_request_exception.disconnect(self.on_exception)
+
+    def on_exception(self, sender, exception, **extra):
+        self.reported.append((type(exception), getattr(exception, 'log_request_id', None)))
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super(ListHandler, self).__init__()
+        self.records = []
+        self.addFilter(RequestIDLogFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class ExceptionsTestCase(unittest.TestCase):
+
+    def test_attach_request_id(self):
+        exception = ValueError()
+        attach_request_id(exception, 'abc-123')
+        self.assertEqual('abc-123', exception.log_request_id)
+        self.assertEqual('abc-123', exception_request_id(exception))
+
+        # The same instance raised again in another request
+        attach_request_id(exception, 'def-456')
+        self.assertEqual('def-456', exception_request_id(exception))
+
+    def test_exception_request_id_fallback(self):
+        with bind_request_id('abc-123'):
+            self.assertEqual('abc-123', exception_request_id(ValueError()))
+        self.assertIsNone(exception_request_id(ValueError()))
+
+    def test_log_filter_uses_exception_request_id(self):
+        handler = ListHandler()
+        logger = logging.getLogger('test_log_filter_uses_exception_request_id')
+        logger.addHandler(handler)
+
+        exception = ValueError()
+        attach_request_id(exception, 'abc-123')
+        try:
+            raise exception
+        except ValueError:
+            logger.exception('failed')
+
+        self.assertEqual('abc-123', handler.records[0].request_id)
+
+    def test_log_filter_prefers_current_request_id(self):
+        handler = ListHandler()
+        logger = logging.getLogger('test_log_filter_prefers_current_request_id')
+        logger.addHandler(handler)
+
+        exception = ValueError()
+        attach_request_id(exception, 'abc-123')
+        with bind_request_id('def-456'):
+            try:
+                raise exception
+            except ValueError:
+                logger.exception('failed')
+
+        self.assertEqual('def-456', handler.records[0].request_id)
+
+
+class FlaskExceptionsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.handled_request_ids = []
+
+        @self.app.route('/')
+        def index():
+            raise RuntimeError('unhandled')
+
+        @self.app.errorhandler(500)
+        def handle_internal_server_error(e):
+            self.handled_request_ids.append(e.original_exception.log_request_id)
+            return 'error', 500
+
+    def stand_in_reporter(self):
+        reporter = StandInReporter()
+        self.addCleanup(reporter.close)
+        return reporter
+
+    def test_reporter_connected_before_extension(self):
+        reporter = self.stand_in_reporter()
+        self.app.config['LOG_REQUEST_ID_ATTACH_TO_EXCEPTIONS'] = True
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+
+        for _ in range(20):
+            self.app.test_client().get('/')
+        self.assertEqual([(RuntimeError, 'def-456')] * 20, reporter.reported)
+
+    def test_attach_to_exceptions(self):
+        self.app.config['LOG_REQUEST_ID_ATTACH_TO_EXCEPTIONS'] = True
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        reporter = self.stand_in_reporter()
+
+        rv = self.app.test_client().get('/')
+        self.assertEqual(500, rv.status_code)
+        self.assertEqual([(RuntimeError, 'def-456')], reporter.reported)
+        self.assertEqual(['def-456'], self.handled_request_ids)
+
+    def test_attach_to_exceptions_disabled(self):
+        self.app.errorhandler(500)(lambda e: ('error', 500))
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        reporter = self.stand_in_reporter()
+
+        self.app.test_client().get('/')
+        self.assertEqual([(RuntimeError, None)], reporter.reported)
+
+    def test_shared_exception_instance(self):
+        shared_error = RuntimeError('shared')
+        logged = ListHandler()
+        self.app.logger.addHandler(logged)
+
+        @self.app.route('/shared')
+        def shared():
+            try:
+                raise shared_error
+            except RuntimeError:
+                self.app.logger.exception('view failed')
+                raise
+
+        self.app.config['LOG_REQUEST_ID_ATTACH_TO_EXCEPTIONS'] = True
+        RequestID(self.app)
+        reporter = self.stand_in_reporter()
+        client = self.app.test_client()
+
+        client.get('/shared', headers={'X-Request-ID': 'B'})
+        client.get('/shared', headers={'X-Request-ID': 'C'})
+
+        self.assertEqual('C', shared_error.log_request_id)
+        self.assertEqual([(RuntimeError, 'B'), (RuntimeError, 'C')], reporter.reported)
+        self.assertEqual(['B', 'C'], self.handled_request_ids)
+        self.assertEqual(['B', 'B', 'C', 'C'], [record.request_id for record in logged.records])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,17 @@
 import mock
+import subprocess
+import sys
 import unittest
 
 from celery import Celery
 from flask_log_request_id.extras.celery import (ExecutedOutsideContext,
                                                 on_before_publish_insert_request_id_header,
-                                                ctx_celery_task_get_request_id)
+                                                on_before_publish_insert_child_request_id_header,
+                                                on_task_prerun_attach_request_baggage,
+                                                ctx_celery_task_get_request_id,
+                                                ctx_celery_task_get_child_counter)
+from flask_log_request_id.local import bind_request_id
+from flask_log_request_id.baggage import with_baggage
 
 
 class MockedTask(object):
@@ -29,10 +36,18 @@ class CeleryIntegrationTestCase(unittest.TestCase):
         on_before_publish_insert_request_id_header(headers=headers)
         self.assertDictEqual(
             {
-                'x_request_id': 15
+                'x_request_id': '15'
             },
             headers)
 
+    @mock.patch('flask_log_request_id.extras.celery.current_request_id')
+    def test_request_id_propagation_without_request_id(self, mocked_current_request_id):
+        mocked_current_request_id.return_value = None
+
+        headers = {}
+        on_before_publish_insert_request_id_header(headers=headers)
+        self.assertDictEqual({}, headers)
+
     @mock.patch('flask_log_request_id.extras.celery.current_task')
     def test_ctx_fetcher_outside_context(self, mocked_current_task):
         mocked_current_task._get_current_object.return_value = None
@@ -46,6 +61,72 @@ class CeleryIntegrationTestCase(unittest.TestCase):
 
         self.assertEqual(ctx_celery_task_get_request_id(), 15)
 
+    def test_enable_hierarchical_request_id_propagation(self):
+        with bind_request_id('root'):
+            headers = [{}, {}]
+            for h in headers:
+                on_before_publish_insert_child_request_id_header(headers=h)
+        self.assertEqual(
+            [{'x_request_id': 'root.1'}, {'x_request_id': 'root.2'}],
+            headers)
+
+    def test_request_baggage_propagation(self):
+        with bind_request_id(with_baggage('root', {'tenant': 'acme'})):
+            headers, child_headers = {}, {}
+            on_before_publish_insert_request_id_header(headers=headers)
+            on_before_publish_insert_child_request_id_header(headers=child_headers)
+        self.assertEqual({'x_request_id': 'root', 'x_request_baggage': 'tenant=acme'}, headers)
+        self.assertEqual({'x_request_id': 'root.1', 'x_request_baggage': 'tenant=acme'}, child_headers)
+        self.assertIs(str, type(headers['x_request_id']))
+        self.assertIs(str, type(child_headers['x_request_id']))
+
+    def test_task_prerun_attach_request_baggage(self):
+        task = mock.Mock()
+        task.request = type('Context', (object,), {})()
+        task.request.get = lambda key, default: getattr(task.request, key, default)
+        task.request.x_request_id = 'root'
+        task.request.x_request_baggage = 'tenant=acme'
+
+        on_task_prerun_attach_request_baggage(task=task)
+        self.assertEqual('root', task.request.x_request_id)
+        self.assertEqual({'tenant': 'acme'}, dict(task.request.x_request_id.baggage))
+
+    @mock.patch('flask_log_request_id.extras.celery.current_task')
+    def test_child_counter_outside_context(self, mocked_current_task):
+        mocked_current_task._get_current_object.return_value = None
+        with self.assertRaises(ExecutedOutsideContext):
+            ctx_celery_task_get_child_counter()
+
+    @mock.patch('flask_log_request_id.extras.celery.current_task')
+    def test_child_counter_inside_context(self, mocked_current_task):
+        mocked_current_task._get_current_object.return_value = True
+        mocked_current_task.request = type('Context', (object,), {})()
+
+        counter = ctx_celery_task_get_child_counter()
+        self.assertEqual(1, next(counter))
+        self.assertIs(counter, ctx_celery_task_get_child_counter())
+        self.assertEqual(2, next(counter))
+
+    def test_eager_task_within_request_regardless_of_import_order(self):
+        code = (
+            'import flask, celery\n'
+            '{imports}\n'
+            'from flask_log_request_id import RequestID, current_request_id\n'
+            'app = flask.Flask(__name__)\n'
+            'RequestID(app)\n'
+            'celery_app = celery.Celery(__name__)\n'
+            '@celery_app.task\n'
+            'def task():\n'
+            '    return current_request_id()\n'
+            'app.add_url_rule("/", "index", lambda: task.apply().get())\n'
+            'response = app.test_client().get("/", headers={{"X-Request-ID": "abc-123"}})\n'
+            'assert response.data == b"abc-123", response.data\n'
+        )
+        for imports in ('import flask_log_request_id.extras.celery\nimport flask_log_request_id.request_id',
+                        'import flask_log_request_id.request_id\nimport flask_log_request_id.extras.celery'):
+            subprocess.check_call([sys.executable, '-c', code.format(imports=imports)])
+
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from kombu import Connection, Exchange, Queue
+
+from flask_log_request_id import current_request_id
+from flask_log_request_id.local import bind_request_id
+from flask_log_request_id.extras.kombu import publish, request_id_consumer
+
+
+class KombuIntegrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Connection('memory://')
+        self.exchange = Exchange('test_exchange', type='direct')
+        self.queue = Queue('test_queue', self.exchange, routing_key='test')
+        self.producer = self.connection.Producer(serializer='json')
+
+    def tearDown(self):
+        self.connection.release()
+
+    def publish(self, body, **kwargs):
+        publish(self.producer, body, exchange=self.exchange, routing_key='test', declare=[self.queue], **kwargs)
+
+    def consume(self, count):
+        found = []
+
+        @request_id_consumer
+        def on_message(body, message):
+            found.append((body, current_request_id()))
+            message.ack()
+
+        with self.connection.Consumer(self.queue, callbacks=[on_message]):
+            for _ in range(count):
+                self.connection.drain_events(timeout=1)
+        return found
+
+    def test_propagation(self):
+        with bind_request_id('abc-123'):
+            self.publish('first')
+            self.publish('second', headers={'custom': 'header'})
+        self.publish('third')
+
+        self.assertEqual(
+            [('first', 'abc-123'), ('second', 'abc-123'), ('third', None)],
+            self.consume(3))
+
+    def test_hierarchical_propagation(self):
+        with bind_request_id('abc-123'):
+            self.publish('first', hierarchical=True)
+            self.publish('second', hierarchical=True)
+
+        self.assertEqual(
+            [('first', 'abc-123.1'), ('second', 'abc-123.2')],
+            self.consume(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import logging
+import multiprocessing
+import pickle
+import sys
+import unittest
+
+import flask
+
+from flask_log_request_id import RequestID, RequestIDLogFilter, current_request_id
+from flask_log_request_id.hierarchy import child_request_id
+from flask_log_request_id.extras.processes import RequestIDProcessPoolExecutor, RequestIDTask, with_request_id
+
+
+def get_request_id(*args):
+    return current_request_id()
+
+
+def get_child_request_ids():
+    return current_request_id(), child_request_id(), child_request_id()
+
+
+def get_log_record_request_id():
+    record = logging.LogRecord('test', logging.INFO, __file__, 0, 'message', (), None)
+    RequestIDLogFilter().filter(record)
+    return record.request_id
+
+
+class ProcessesIntegrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        RequestID(self.app, request_id_parser=lambda: 'abc-123')
+
+    def test_task_is_picklable(self):
+        task = pickle.loads(pickle.dumps(RequestIDTask(get_request_id, 'abc-123')))
+        self.assertEqual('abc-123', task())
+
+    def test_with_request_id(self):
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            task = with_request_id(get_request_id)
+
+        self.assertEqual('abc-123', task.request_id)
+        self.assertEqual('abc-123', task())
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'ProcessPoolExecutor accepts mp_context on Python 3.7 or later')
+    def test_executor_with_spawn(self):
+        context = multiprocessing.get_context('spawn')
+        with RequestIDProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                future = executor.submit(get_log_record_request_id)
+                results = list(executor.map(get_request_id, range(2)))
+
+            self.assertEqual('abc-123', future.result())
+            self.assertEqual(['abc-123', 'abc-123'], results)
+
+            # Outside of the request the id is not leaked by the worker process
+            self.assertIsNone(executor.submit(get_request_id).result())
+
+    def test_with_request_id_hierarchical(self):
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            tasks = [with_request_id(get_request_id, hierarchical=True) for _ in range(2)]
+
+        self.assertEqual(['abc-123.1', 'abc-123.2'], [task() for task in tasks])
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'ProcessPoolExecutor accepts mp_context on Python 3.7 or later')
+    def test_executor_hierarchical_with_spawn(self):
+        context = multiprocessing.get_context('spawn')
+        with RequestIDProcessPoolExecutor(max_workers=2, mp_context=context, hierarchical=True) as executor:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                futures = [executor.submit(get_child_request_ids) for _ in range(3)]
+
+            self.assertEqual(
+                [('abc-123.1', 'abc-123.1.1', 'abc-123.1.2'),
+                 ('abc-123.2', 'abc-123.2.1', 'abc-123.2.2'),
+                 ('abc-123.3', 'abc-123.3.1', 'abc-123.3.2')],
+                [future.result() for future in futures])
+
+    def test_pool_with_spawn(self):
+        with multiprocessing.get_context('spawn').Pool(processes=2) as pool:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                result = pool.apply_async(with_request_id(get_log_record_request_id))
+                children = [pool.apply_async(with_request_id(get_child_request_ids, hierarchical=True))
+                            for _ in range(2)]
+
+            self.assertEqual('abc-123', result.get(timeout=30))
+            self.assertEqual(
+                [('abc-123.1', 'abc-123.1.1', 'abc-123.1.2'),
+                 ('abc-123.2', 'abc-123.2.1', 'abc-123.2.2')],
+                [child.get(timeout=30) for child in children])
+
+
+if __name__ == '__main__':
+    unittest.main()
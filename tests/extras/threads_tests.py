@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+import flask
+
+from flask_log_request_id import RequestID, current_request_id
+from flask_log_request_id.hierarchy import child_request_id
+from flask_log_request_id.extras.threads import RequestIDThreadPoolExecutor, copy_request_context
+
+
+class ThreadsIntegrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        RequestID(self.app, request_id_parser=lambda: 'abc-123')
+
+    def test_thread_without_propagation(self):
+        found = []
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            thread = threading.Thread(target=lambda: found.append(current_request_id()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual([None], found)
+
+    def test_copy_request_context(self):
+        found = []
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            thread = threading.Thread(target=copy_request_context(lambda: found.append(current_request_id())))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(['abc-123'], found)
+
+    def test_copy_request_context_keeps_metadata(self):
+        def task(a, b=None):
+            """Docstring"""
+            return a, b
+
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            wrapped = copy_request_context(task)
+
+        self.assertEqual('task', wrapped.__name__)
+        self.assertEqual('Docstring', wrapped.__doc__)
+        self.assertEqual((1, 2), wrapped(1, b=2))
+
+    def test_executor_submit(self):
+        with RequestIDThreadPoolExecutor(max_workers=2) as executor:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                future = executor.submit(current_request_id)
+            self.assertEqual('abc-123', future.result())
+
+            # Outside of the request the id is not leaked by the worker thread
+            self.assertIsNone(executor.submit(current_request_id).result())
+
+    def test_executor_map(self):
+        with RequestIDThreadPoolExecutor(max_workers=2) as executor:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                results = list(executor.map(lambda x: (x, current_request_id()), range(3)))
+
+        self.assertEqual([(0, 'abc-123'), (1, 'abc-123'), (2, 'abc-123')], results)
+
+    def test_executor_hierarchical(self):
+        with RequestIDThreadPoolExecutor(max_workers=2, hierarchical=True) as executor:
+            with self.app.test_request_context():
+                self.app.preprocess_request()
+                futures = [executor.submit(lambda: (current_request_id(), child_request_id())) for _ in range(3)]
+                results = [f.result() for f in futures]
+                own_child = child_request_id()
+
+        self.assertEqual(
+            [('abc-123.1', 'abc-123.1.1'), ('abc-123.2', 'abc-123.2.1'), ('abc-123.3', 'abc-123.3.1')],
+            results)
+        self.assertEqual('abc-123.4', own_child)
+
+    def test_copy_request_context_hierarchical(self):
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            tasks = [copy_request_context(current_request_id, hierarchical=True) for _ in range(2)]
+
+        self.assertEqual(['abc-123.1', 'abc-123.2'], [task() for task in tasks])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import logging
+import subprocess
+import sys
+import unittest
+
+import flask
+
+import flask_log_request_id
+from flask_log_request_id import RequestID, RequestIDLogFilter
+from flask_log_request_id.local import bind_request_id
+from flask_log_request_id.baggage import with_baggage
+
+
+def _log_record():
+    return logging.LogRecord('test', logging.INFO, __file__, 0, 'message', (), None)
+
+
+class RequestIDLogFilterTestCase(unittest.TestCase):
+
+    def test_outside_context(self):
+        record = _log_record()
+        self.assertTrue(RequestIDLogFilter().filter(record))
+        self.assertIsNone(record.request_id)
+        self.assertEqual({}, dict(record.request_baggage))
+
+    def test_bound_context(self):
+        record = _log_record()
+        with bind_request_id('abc-123'):
+            RequestIDLogFilter().filter(record)
+        self.assertEqual('abc-123', record.request_id)
+
+    def test_baggage(self):
+        record = _log_record()
+        with bind_request_id(with_baggage('abc-123', {'tenant': 'acme'})):
+            RequestIDLogFilter().filter(record)
+        self.assertEqual('abc-123', record.request_id)
+        self.assertEqual({'tenant': 'acme'}, dict(record.request_baggage))
+
+    def test_flask_context(self):
+        app = flask.Flask(__name__)
+        RequestID(app, request_id_parser=lambda: 'abc-123')
+        record = _log_record()
+        with app.test_request_context():
+            app.preprocess_request()
+            RequestIDLogFilter().filter(record)
+        self.assertEqual('abc-123', record.request_id)
+
+
+class LazyImportTestCase(unittest.TestCase):
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            flask_log_request_id.does_not_exist
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'Exports are loaded lazily on Python 3.7 or later (PEP 562)')
+    def test_filter_does_not_import_flask(self):
+        code = (
+            'import logging, sys\n'
+            'import flask_log_request_id\n'
+            'from flask_log_request_id import RequestIDLogFilter, current_request_id\n'
+            'from flask_log_request_id.extras.threads import RequestIDThreadPoolExecutor\n'
+            'record = logging.LogRecord("test", logging.INFO, "", 0, "message", (), None)\n'
+            'RequestIDLogFilter().filter(record)\n'
+            'assert record.request_id is None\n'
+            'assert "flask" not in sys.modules, "flask was imported"\n'
+            'flask_log_request_id.RequestID\n'
+            'assert "flask" in sys.modules\n'
+        )
+        subprocess.check_call([sys.executable, '-c', code])
+
+
+if __name__ == '__main__':
+    unittest.main()
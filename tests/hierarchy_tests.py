@@ -0,0 +1,53 @@
+import unittest
+
+import flask
+
+from flask_log_request_id import RequestID
+from flask_log_request_id.hierarchy import child_request_id, root_request_id, current_root_request_id
+from flask_log_request_id.local import bind_request_id
+
+
+class HierarchyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        RequestID(self.app, request_id_parser=lambda: 'root')
+
+    def test_child_outside_context(self):
+        self.assertIsNone(child_request_id())
+
+    def test_child_in_flask_context(self):
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            self.assertEqual('root.1', child_request_id())
+            self.assertEqual('root.2', child_request_id())
+            self.assertEqual('root', current_root_request_id())
+
+        # Counter is per request
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            self.assertEqual('root.1', child_request_id())
+
+    def test_grandchild_in_bound_context(self):
+        with bind_request_id('root.1'):
+            self.assertEqual('root.1.1', child_request_id())
+            self.assertEqual('root.1.2', child_request_id())
+            self.assertEqual('root', current_root_request_id())
+
+            with bind_request_id('root.1.2'):
+                self.assertEqual('root.1.2.1', child_request_id())
+            self.assertEqual('root.1.3', child_request_id())
+
+    def test_child_of_none(self):
+        with bind_request_id(None):
+            self.assertIsNone(child_request_id())
+            self.assertIsNone(current_root_request_id())
+
+    def test_root_request_id(self):
+        self.assertIsNone(root_request_id(None))
+        self.assertEqual('root', root_request_id('root'))
+        self.assertEqual('root', root_request_id('root.1.3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
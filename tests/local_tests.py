@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from flask_log_request_id.ctx_fetcher import ExecutedOutsideContext
+from flask_log_request_id.local import local_ctx_get_request_id, bind_request_id
+
+
+class BindRequestIdTestCase(unittest.TestCase):
+
+    def test_outside_context(self):
+        with self.assertRaises(ExecutedOutsideContext):
+            local_ctx_get_request_id()
+
+    def test_bind(self):
+        with bind_request_id('abc-123') as request_id:
+            self.assertEqual('abc-123', request_id)
+            self.assertEqual('abc-123', local_ctx_get_request_id())
+
+        with self.assertRaises(ExecutedOutsideContext):
+            local_ctx_get_request_id()
+
+    def test_bind_none(self):
+        with bind_request_id(None):
+            self.assertIsNone(local_ctx_get_request_id())
+
+    def test_nested_bind(self):
+        with bind_request_id('outer'):
+            with bind_request_id('inner'):
+                self.assertEqual('inner', local_ctx_get_request_id())
+            self.assertEqual('outer', local_ctx_get_request_id())
+
+    def test_bind_is_thread_local(self):
+        found = []
+
+        def other_thread():
+            try:
+                found.append(local_ctx_get_request_id())
+            except ExecutedOutsideContext:
+                found.append('outside')
+
+        with bind_request_id('abc-123'):
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(['outside'], found)
+
+
+if __name__ == '__main__':
+    unittest.main()
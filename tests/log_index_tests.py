@@ -0,0 +1,187 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from flask_log_request_id import cli
+from flask_log_request_id.log_index import LogIndex
+
+
+WEB_LOG = (
+    b'2017-07-25 16:15:25,912 - app - level=INFO - request_id=abc - Adding two numbers\n'
+    b'2017-07-25 16:15:25,913 - werkzeug - level=INFO - request_id=None - GET /\n'
+    b'2017-07-25 16:15:27,100 - app - level=INFO - request_id=def - Other request\n'
+    b'2017-07-25 16:15:28,000 - app - level=INFO - request_id=abc - Done\n'
+)
+CELERY_LOG = (
+    b'[2017-07-25 16:15:26,500: INFO] request_id=abc.1 - Task started\n'
+    b'[2017-07-25 16:15:26,600: INFO] request_id=abcd - Unrelated task\n'
+)
+
+
+class LogFilesMixin(object):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.index_path = self.path('index.idx')
+        self.web_log = self.path('web.log')
+        with open(self.web_log, 'wb') as f:
+            f.write(WEB_LOG)
+        self.celery_log = self.path('celery.log.gz')
+        with gzip.open(self.celery_log, 'wb') as f:
+            f.write(CELERY_LOG)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def lines(self, request_id, include_children=False):
+        with LogIndex(self.index_path) as log_index:
+            return [line for _, line in log_index.lines(request_id, include_children)]
+
+
+class LogIndexTestCase(LogFilesMixin, unittest.TestCase):
+
+    def test_index_and_lookup(self):
+        with LogIndex(self.index_path) as log_index:
+            self.assertEqual(5, log_index.update([self.web_log, self.celery_log]))
+            self.assertEqual(0, log_index.update())
+            self.assertEqual(sorted([self.web_log, self.celery_log]), log_index.paths)
+
+        self.assertEqual(
+            [b'2017-07-25 16:15:25,912 - app - level=INFO - request_id=abc - Adding two numbers\n',
+             b'2017-07-25 16:15:28,000 - app - level=INFO - request_id=abc - Done\n'],
+            self.lines('abc'))
+        self.assertEqual([], self.lines('None'))
+
+    def test_lookup_with_children_in_time_order(self):
+        with LogIndex(self.index_path) as log_index:
+            log_index.update([self.web_log, self.celery_log])
+
+        self.assertEqual(
+            [b'2017-07-25 16:15:25,912 - app - level=INFO - request_id=abc - Adding two numbers\n',
+             b'[2017-07-25 16:15:26,500: INFO] request_id=abc.1 - Task started\n',
+             b'2017-07-25 16:15:28,000 - app - level=INFO - request_id=abc - Done\n'],
+            self.lines('abc', include_children=True))
+
+    def test_gzip_lines_out_of_offset_order(self):
+        with gzip.open(self.celery_log, 'wb') as f:
+            f.write(b'[2017-07-25 16:15:26,900: INFO] request_id=xyz - Second\n'
+                    b'[2017-07-25 16:15:26,500: INFO] request_id=abcd - Unrelated task\n'
+                    b'[2017-07-25 16:15:26,100: INFO] request_id=xyz - First\n')
+
+        with LogIndex(self.index_path) as log_index:
+            log_index.update([self.celery_log])
+            with mock.patch('gzip.open', side_effect=gzip.open) as gzip_open:
+                self.assertEqual([b'[2017-07-25 16:15:26,100: INFO] request_id=xyz - First\n',
+                                  b'[2017-07-25 16:15:26,900: INFO] request_id=xyz - Second\n'],
+                                 [line for _, line in log_index.lines('xyz')])
+            self.assertEqual(1, gzip_open.call_count)
+
+    def test_incremental_update(self):
+        with open(self.web_log, 'ab') as f:
+            f.write(b'2017-07-25 16:15:29,000 - app - level=INFO - request_id=abc - Part')
+
+        with LogIndex(self.index_path) as log_index:
+            self.assertEqual(3, log_index.update([self.web_log]))
+
+            # Complete the partial line
+            with open(self.web_log, 'ab') as f:
+                f.write(b'ial line\n')
+            self.assertEqual(1, log_index.update())
+
+        self.assertEqual(3, len(self.lines('abc')))
+        self.assertEqual(
+            b'2017-07-25 16:15:29,000 - app - level=INFO - request_id=abc - Partial line\n',
+            self.lines('abc')[-1])
+
+    def test_rotated_file(self):
+        with LogIndex(self.index_path) as log_index:
+            log_index.update([self.web_log])
+
+            with open(self.web_log, 'wb') as f:
+                f.write(b'2017-07-26 10:00:00,000 - app - level=INFO - request_id=abc - Rotated\n')
+            self.assertEqual(1, log_index.update())
+
+        self.assertEqual([b'2017-07-26 10:00:00,000 - app - level=INFO - request_id=abc - Rotated\n'],
+                         self.lines('abc'))
+
+    def test_removed_file(self):
+        with LogIndex(self.index_path) as log_index:
+            log_index.update([self.web_log, self.celery_log])
+            os.rename(self.web_log, self.web_log + '.1')
+
+            # Lines of the missing file are skipped without updating the index
+            self.assertEqual([b'[2017-07-25 16:15:26,500: INFO] request_id=abc.1 - Task started\n'],
+                             [line for _, line in log_index.lines('abc', include_children=True)])
+
+            self.assertEqual(0, log_index.update())
+            self.assertEqual([self.celery_log], log_index.paths)
+            self.assertEqual([], log_index.lookup('abc'))
+
+    def test_update_missing_file(self):
+        with LogIndex(self.index_path) as log_index:
+            with self.assertRaises(FileNotFoundError):
+                log_index.update([self.web_log, self.path('wbe.log')])
+            self.assertEqual([], log_index.paths)
+
+    def test_custom_pattern_resets_index(self):
+        with LogIndex(self.index_path) as log_index:
+            log_index.update([self.web_log])
+
+        with LogIndex(self.index_path, r'level=(\w+)') as log_index:
+            self.assertEqual([], log_index.paths)
+            self.assertEqual(4, log_index.update([self.web_log]))
+            self.assertEqual(4, len(log_index.lookup('INFO')))
+
+
+class CLITestCase(LogFilesMixin, unittest.TestCase):
+
+    def run_cli(self, *argv, exit_code=0):
+        stdout = mock.Mock()
+        stdout.buffer = io.BytesIO()
+        with mock.patch('sys.stdout', stdout):
+            self.assertEqual(exit_code, cli.main(['--index', self.index_path] + list(argv)))
+        return stdout.buffer.getvalue()
+
+    def test_index_and_query(self):
+        self.run_cli('index', self.web_log, self.celery_log)
+
+        self.assertEqual(
+            b'2017-07-25 16:15:27,100 - app - level=INFO - request_id=def - Other request\n',
+            self.run_cli('query', 'def'))
+        self.assertEqual(
+            self.celery_log.encode('utf-8') + b': [2017-07-25 16:15:26,600: INFO] request_id=abcd - Unrelated task\n',
+            self.run_cli('query', '--with-filename', 'abcd'))
+
+    def test_index_missing_file(self):
+        with mock.patch('sys.stderr', io.StringIO()) as stderr:
+            self.run_cli('index', self.web_log, self.path('wbe.log'), exit_code=1)
+
+        self.assertIn('wbe.log: No such file or directory', stderr.getvalue())
+        self.assertEqual(b'', self.run_cli('query', 'abc'))
+
+    def test_query_with_removed_file(self):
+        self.run_cli('index', self.web_log)
+        os.remove(self.web_log)
+
+        self.assertEqual(b'', self.run_cli('query', '--no-update', 'abc'))
+        self.assertEqual(b'', self.run_cli('query', 'abc'))
+
+    def test_query_updates_index(self):
+        self.run_cli('index', self.web_log)
+        with open(self.web_log, 'ab') as f:
+            f.write(b'2017-07-25 16:15:29,000 - app - level=INFO - request_id=def - Appended\n')
+
+        self.assertEqual(1, self.run_cli('query', '--no-update', 'def').count(b'\n'))
+        self.assertEqual(2, self.run_cli('query', 'def').count(b'\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
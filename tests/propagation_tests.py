@@ -0,0 +1,116 @@
+import threading
+import unittest
+
+from flask_log_request_id import current_request_id
+from flask_log_request_id.local import bind_request_id
+from flask_log_request_id.baggage import with_baggage, current_request_baggage
+from flask_log_request_id.propagation import inject, extract, consumer, RequestIDQueue, Message, queue_consumer
+
+
+class PropagationTestCase(unittest.TestCase):
+
+    def test_inject(self):
+        with bind_request_id('abc-123'):
+            self.assertEqual({'x_request_id': 'abc-123'}, inject({}))
+            self.assertEqual({'X-Request-ID': 'abc-123'}, inject({}, header_name='X-Request-ID'))
+
+    def test_inject_does_not_overwrite(self):
+        with bind_request_id('abc-123'):
+            self.assertEqual({'x_request_id': 'def-456'}, inject({'x_request_id': 'def-456'}))
+
+    def test_inject_outside_context(self):
+        self.assertEqual({}, inject({}))
+
+    def test_inject_hierarchical(self):
+        with bind_request_id('abc-123'):
+            self.assertEqual({'x_request_id': 'abc-123.1'}, inject({}, hierarchical=True))
+            self.assertEqual({'x_request_id': 'abc-123.2'}, inject({}, hierarchical=True))
+
+    def test_inject_baggage(self):
+        with bind_request_id(with_baggage('abc-123', {'tenant': 'acme'})):
+            self.assertEqual({'x_request_id': 'abc-123', 'x_request_baggage': 'tenant=acme'}, inject({}))
+            self.assertEqual(
+                {'X-Request-ID': 'abc-123', 'X-Request-Baggage': 'tenant=acme'},
+                inject({}, header_name='X-Request-ID', baggage_header_name='X-Request-Baggage'))
+
+    def test_extract_baggage(self):
+        request_id = extract({'x_request_id': 'abc-123', 'x_request_baggage': 'tenant=acme'})
+        self.assertEqual('abc-123', request_id)
+        self.assertEqual({'tenant': 'acme'}, dict(request_id.baggage))
+
+    def test_consumer_binds_baggage(self):
+        @consumer(lambda headers: headers)
+        def handler(headers):
+            return dict(current_request_baggage())
+
+        self.assertEqual({'tenant': 'acme'}, handler({'x_request_id': 'abc-123', 'x_request_baggage': 'tenant=acme'}))
+
+    def test_consumer_custom_baggage_header(self):
+        @consumer(lambda headers: headers, header_name='X-Request-ID', baggage_header_name='X-Request-Baggage')
+        def handler(headers):
+            return current_request_id(), dict(current_request_baggage())
+
+        self.assertEqual(('abc-123', {'tenant': 'acme'}),
+                         handler({'X-Request-ID': 'abc-123', 'X-Request-Baggage': 'tenant=acme'}))
+
+    def test_extract(self):
+        self.assertEqual('abc-123', extract({'x_request_id': 'abc-123'}))
+        self.assertIsNone(extract({}))
+        self.assertIsNone(extract(None))
+
+    def test_extract_bytes(self):
+        # Fields of a redis stream entry, as returned by redis-py without decode_responses
+        request_id = extract({b'x_request_id': b'abc-123', b'x_request_baggage': b'tenant=acme', b'body': b'{}'})
+        self.assertEqual('abc-123', request_id)
+        self.assertEqual({'tenant': 'acme'}, dict(request_id.baggage))
+
+        self.assertEqual('abc-123', extract({b'x_request_id': b'abc-123'}))
+        self.assertIsInstance(extract({b'x_request_id': b'abc-123'}), str)
+
+    def test_consumer(self):
+        @consumer(lambda headers, body: headers)
+        def handler(headers, body):
+            """Docstring"""
+            return body, current_request_id()
+
+        self.assertEqual('Docstring', handler.__doc__)
+        self.assertEqual(('body', 'abc-123'), handler({'x_request_id': 'abc-123'}, 'body'))
+        self.assertEqual(('body', None), handler({}, 'body'))
+        self.assertIsNone(current_request_id())
+
+
+class RequestIDQueueTestCase(unittest.TestCase):
+
+    def test_queue(self):
+        q = RequestIDQueue()
+        with bind_request_id('abc-123'):
+            q.put('body')
+        q.put('other')
+
+        self.assertEqual(Message({'x_request_id': 'abc-123'}, 'body'), q.get_nowait())
+        self.assertEqual(Message({}, 'other'), q.get_nowait())
+
+    def test_queue_consumer_thread(self):
+        q = RequestIDQueue()
+        found = []
+
+        @queue_consumer
+        def handler(message):
+            found.append((message.body, current_request_id()))
+
+        def worker():
+            handler(q.get())
+            q.task_done()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        with bind_request_id('abc-123'):
+            q.put('body')
+        q.join()
+        thread.join()
+
+        self.assertEqual([('body', 'abc-123')], found)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 import flask
 import unittest
 
-from flask_log_request_id.request_id import RequestID, current_request_id
+from flask_log_request_id.request_id import (RequestID, current_request_id, add_request_baggage,
+                                             flask_ctx_get_request_id, flask_ctx_get_child_counter)
+from flask_log_request_id.ctx_fetcher import current_child_counter
+from flask_log_request_id.local import bind_request_id, local_ctx_get_request_id, local_ctx_get_child_counter
+from flask_log_request_id.baggage import current_request_baggage
 from mock import patch
 
 
@@ -12,6 +16,19 @@ class RequestIDTestCase(unittest.TestCase):
         self.app.route('/')(lambda: 'hello world')
         self.app.testing = True
 
+    def test_flask_fetchers_are_tried_before_local(self):
+        # Flask is the most common context, so it must not pay for a lookup of the thread local binding first
+        for fetcher, flask_fetcher, local_fetcher in (
+                (current_request_id, flask_ctx_get_request_id, local_ctx_get_request_id),
+                (current_child_counter, flask_ctx_get_child_counter, local_ctx_get_child_counter)):
+            self.assertLess(fetcher.ctx_fetchers.index(flask_fetcher), fetcher.ctx_fetchers.index(local_fetcher))
+
+        RequestID(self.app)
+        with self.app.test_request_context(headers={'X-Request-ID': 'abc-123'}):
+            self.app.preprocess_request()
+            with bind_request_id('def-456'):
+                self.assertEqual('abc-123', current_request_id())
+
     def test_lazy_initialization(self):
         # Bug #38: https://github.com/Workable/flask-log-request-id/issues/38
         request_id = RequestID()
@@ -82,3 +99,208 @@ class RequestIDTestCase(unittest.TestCase):
             pass
 
         mock_logger.info.assert_not_called()
+
+
+class RequestIDExclusionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+
+        self.app.route('/')(lambda: 'hello world')
+        self.app.route('/healthz', endpoint='healthz')(lambda: 'ok')
+        self.app.route('/metrics/process', endpoint='metrics')(lambda: 'metrics')
+        self.app.testing = True
+
+    def test_exclude_endpoint(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_EXCLUDE_ENDPOINTS': ['healthz']
+        })
+        RequestID(self.app, request_id_parser=lambda: 'fixedid')
+        with self.app.test_request_context('/healthz'):
+            self.app.preprocess_request()
+            self.assertIsNone(current_request_id())
+
+        with self.app.test_request_context('/'):
+            self.app.preprocess_request()
+            self.assertEqual('fixedid', current_request_id())
+
+    def test_exclude_path_prefix(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_EXCLUDE_PATH_PREFIXES': ['/metrics']
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        with self.app.test_request_context('/metrics/process'):
+            self.app.preprocess_request()
+            self.assertIsNone(current_request_id())
+
+        with self.app.test_request_context('/'):
+            self.app.preprocess_request()
+            self.assertEqual('def-456', current_request_id())
+
+    def test_exclude_method(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_EXCLUDE_METHODS': ['options']
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        with self.app.test_request_context('/', method='OPTIONS'):
+            self.app.preprocess_request()
+            self.assertIsNone(current_request_id())
+
+        with self.app.test_request_context('/', method='GET'):
+            self.app.preprocess_request()
+            self.assertEqual('def-456', current_request_id())
+
+    def test_exclude_single_string_values(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_EXCLUDE_PATH_PREFIXES': '/metrics',
+            'LOG_REQUEST_ID_EXCLUDE_METHODS': 'options',
+            'LOG_REQUEST_ID_EXCLUDE_ENDPOINTS': 'healthz'
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        for path, method in [('/metrics/process', 'GET'), ('/', 'OPTIONS'), ('/healthz', 'GET')]:
+            with self.app.test_request_context(path, method=method):
+                self.app.preprocess_request()
+                self.assertIsNone(current_request_id())
+
+        with self.app.test_request_context('/'):
+            self.app.preprocess_request()
+            self.assertEqual('def-456', current_request_id())
+
+    @patch('flask_log_request_id.request_id.logger')
+    def test_excluded_request_is_not_logged(self, mock_logger):
+        self.app.config.update({
+            'LOG_REQUEST_ID_LOG_ALL_REQUESTS': True,
+            'LOG_REQUEST_ID_EXCLUDE_ENDPOINTS': ['healthz']
+        })
+        RequestID(self.app)
+
+        client = self.app.test_client()
+        client.get('/healthz')
+        mock_logger.info.assert_not_called()
+
+        client.get('/')
+        mock_logger.info.assert_called_once_with('127.0.0.1 - - "GET / 200"')
+
+
+class RequestIDResponseHeaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.app.testing = True
+
+        @self.app.route('/')
+        def index():
+            return 'hello world'
+
+        @self.app.route('/stream')
+        def stream():
+            return flask.Response(flask.stream_with_context(iter(['hello', ' ', 'world'])))
+
+        @self.app.route('/handled')
+        def handled():
+            raise KeyError('handled')
+
+        @self.app.route('/unhandled')
+        def unhandled():
+            raise RuntimeError('unhandled')
+
+        @self.app.errorhandler(KeyError)
+        def handle_key_error(e):
+            return 'handled error', 400
+
+    def test_response_header_disabled(self):
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        rv = self.app.test_client().get('/')
+        self.assertNotIn('X-Request-ID', rv.headers)
+
+    def test_response_header(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_RESPONSE_HEADER': 'X-Request-ID'
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        rv = self.app.test_client().get('/')
+        self.assertEqual('def-456', rv.headers['X-Request-ID'])
+
+    def test_response_header_echoes_parsed_id(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_RESPONSE_HEADER': 'X-Request-ID'
+        })
+        RequestID(self.app)
+        rv = self.app.test_client().get('/', headers={'X-Request-ID': '1-67891234-def'})
+        self.assertEqual('1-67891234-def', rv.headers['X-Request-ID'])
+
+    def test_response_header_streamed(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_RESPONSE_HEADER': 'X-Request-ID'
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        rv = self.app.test_client().get('/stream')
+        self.assertEqual(b'hello world', rv.data)
+        self.assertEqual('def-456', rv.headers['X-Request-ID'])
+
+    def test_response_header_error_handlers(self):
+        self.app.testing = False
+        self.app.config.update({
+            'LOG_REQUEST_ID_RESPONSE_HEADER': 'X-Request-ID'
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        client = self.app.test_client()
+
+        rv = client.get('/handled')
+        self.assertEqual(400, rv.status_code)
+        self.assertEqual('def-456', rv.headers['X-Request-ID'])
+
+        rv = client.get('/unhandled')
+        self.assertEqual(500, rv.status_code)
+        self.assertEqual('def-456', rv.headers['X-Request-ID'])
+
+        rv = client.get('/not-found')
+        self.assertEqual(404, rv.status_code)
+        self.assertEqual('def-456', rv.headers['X-Request-ID'])
+
+    def test_response_header_excluded(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_RESPONSE_HEADER': 'X-Request-ID',
+            'LOG_REQUEST_ID_EXCLUDE_ENDPOINTS': ['index']
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        rv = self.app.test_client().get('/')
+        self.assertNotIn('X-Request-ID', rv.headers)
+
+
+class RequestIDBaggageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.app.testing = True
+
+    def test_parse_baggage_header(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_BAGGAGE_HEADER': 'X-Request-Baggage'
+        })
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        with self.app.test_request_context(headers={'X-Request-Baggage': 'tenant=acme,user=15'}):
+            self.app.preprocess_request()
+            self.assertEqual('def-456', current_request_id())
+            self.assertEqual({'tenant': 'acme', 'user': '15'}, dict(current_request_baggage()))
+
+    def test_baggage_header_disabled(self):
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        with self.app.test_request_context(headers={'X-Request-Baggage': 'tenant=acme'}):
+            self.app.preprocess_request()
+            self.assertEqual({}, dict(current_request_baggage()))
+
+    def test_add_request_baggage(self):
+        RequestID(self.app, request_id_generator=lambda: 'def-456')
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            self.assertEqual('def-456', add_request_baggage(tenant='acme'))
+            add_request_baggage(user=15)
+            self.assertEqual('def-456', current_request_id())
+            self.assertEqual({'tenant': 'acme', 'user': '15'}, dict(current_request_baggage()))
+
+    def test_add_request_baggage_without_request_id(self):
+        self.app.config.update({
+            'LOG_REQUEST_ID_GENERATE_IF_NOT_FOUND': False
+        })
+        RequestID(self.app)
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            self.assertIsNone(add_request_baggage(tenant='acme'))